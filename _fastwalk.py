@@ -0,0 +1,176 @@
+"""Bulk directory enumeration for very large PDF trees.
+
+macOS reads whole directories per syscall with getattrlistbulk(2), Windows
+uses FindFirstFileExW with FindExInfoBasic and FIND_FIRST_EX_LARGE_FETCH.
+Everywhere else (or if the native call can't be bound) os.scandir is used.
+
+Each walker yields (path, filename, stat_key), where stat_key is the file's
+(mtime_ns, size) as os.stat would report it, or None if the walk couldn't
+get it for free (symbolic links, for instance).
+"""
+import ctypes
+import os
+import struct
+import sys
+
+
+def _iter_scandir(root, suffixes):
+    """Yield (path, filename, stat_key) for files below root ending in one of suffixes"""
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue  # Unreadable directory, os.walk skipped these as well
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(suffixes) and entry.is_file():
+                    # Free on Windows, where scandir already has the find data
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        yield entry.path, entry.name, None
+                    else:
+                        yield entry.path, entry.name, (st.st_mtime_ns, st.st_size)
+
+
+iter_files = _iter_scandir
+
+
+if sys.platform == "darwin":
+    class _AttrList(ctypes.Structure):
+        _fields_ = [("bitmapcount", ctypes.c_ushort),
+                    ("reserved", ctypes.c_uint16),
+                    ("commonattr", ctypes.c_uint32),
+                    ("volattr", ctypes.c_uint32),
+                    ("dirattr", ctypes.c_uint32),
+                    ("fileattr", ctypes.c_uint32),
+                    ("forkattr", ctypes.c_uint32)]
+
+    _ATTR_BIT_MAP_COUNT = 5
+    _ATTR_CMN_NAME = 0x00000001
+    _ATTR_CMN_OBJTYPE = 0x00000008
+    _ATTR_CMN_MODTIME = 0x00000400
+    _ATTR_FILE_DATALENGTH = 0x00000200
+    _ATTR_CMN_RETURNED_ATTRS = 0x80000000
+    _VREG, _VDIR, _VLNK = 1, 2, 5
+    _BULK_BUF_SIZE = 65536
+
+    def _iter_getattrlistbulk(root, suffixes):
+        """getattrlistbulk(2) walk returning names, object types, mtimes and sizes in bulk"""
+        attrs = _AttrList(_ATTR_BIT_MAP_COUNT, 0,
+                          _ATTR_CMN_RETURNED_ATTRS | _ATTR_CMN_NAME | _ATTR_CMN_OBJTYPE
+                          | _ATTR_CMN_MODTIME, 0, 0, _ATTR_FILE_DATALENGTH)
+        buf = ctypes.create_string_buffer(_BULK_BUF_SIZE)
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            except OSError:
+                continue
+            try:
+                while True:
+                    count = _getattrlistbulk(fd, ctypes.byref(attrs), buf, _BULK_BUF_SIZE, 0)
+                    if count <= 0:  # 0 is end of directory, -1 an error
+                        break
+                    data = buf.raw
+                    offset = 0
+                    for _ in range(count):
+                        # u_int32 length, attribute_set_t (5 x u_int32), then the returned
+                        # attributes in bit order: common ones first, then file ones
+                        length, returned, _, _, returned_file, _ = struct.unpack_from("=6I", data, offset)
+                        pos = offset + 24
+                        name_offset, name_length = struct.unpack_from("=iI", data, pos)
+                        name = os.fsdecode(data[pos + name_offset:pos + name_offset + name_length - 1])
+                        pos += 8
+                        objtype = 0
+                        if returned & _ATTR_CMN_OBJTYPE:
+                            objtype = struct.unpack_from("=I", data, pos)[0]
+                            pos += 4
+                        key = None
+                        if returned & _ATTR_CMN_MODTIME and returned_file & _ATTR_FILE_DATALENGTH:
+                            sec, nsec, size = struct.unpack_from("=qqq", data, pos)  # timespec, off_t
+                            key = (sec * 1000000000 + nsec, size)
+                        offset += length
+
+                        path = os.path.join(directory, name)
+                        if objtype == _VDIR:
+                            stack.append(path)
+                        elif name.endswith(suffixes):
+                            if objtype == _VREG:
+                                yield path, name, key
+                            elif objtype == _VLNK and os.path.isfile(path):
+                                yield path, name, None  # key describes the link, not its target
+            finally:
+                os.close(fd)
+
+    try:
+        _libc = ctypes.CDLL(None, use_errno=True)
+        _getattrlistbulk = _libc.getattrlistbulk  # macOS 10.10+
+        _getattrlistbulk.argtypes = [ctypes.c_int, ctypes.POINTER(_AttrList), ctypes.c_void_p,
+                                     ctypes.c_size_t, ctypes.c_uint64]
+        _getattrlistbulk.restype = ctypes.c_int
+        iter_files = _iter_getattrlistbulk
+    except (OSError, AttributeError):
+        pass
+
+elif os.name == "nt":
+    from ctypes import wintypes
+
+    _FIND_EX_INFO_BASIC = 1
+    _FIND_EX_SEARCH_NAME_MATCH = 0
+    _FIND_FIRST_EX_LARGE_FETCH = 2
+    _FILE_ATTRIBUTE_DIRECTORY = 0x10
+    _FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+    _INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+    _EPOCH_AS_FILETIME = 116444736000000000  # 1970-01-01 in 100 ns ticks since 1601
+
+    def _iter_findfirstfile(root, suffixes):
+        """FindFirstFileExW walk skipping short names and fetching large batches"""
+        data = wintypes.WIN32_FIND_DATAW()
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            handle = _FindFirstFileExW(os.path.join(directory, "*"), _FIND_EX_INFO_BASIC,
+                                       ctypes.byref(data), _FIND_EX_SEARCH_NAME_MATCH,
+                                       None, _FIND_FIRST_EX_LARGE_FETCH)
+            if handle == _INVALID_HANDLE_VALUE:
+                continue
+            try:
+                while True:
+                    name, attributes = data.cFileName, data.dwFileAttributes
+                    if attributes & _FILE_ATTRIBUTE_DIRECTORY:
+                        # Like os.walk, don't descend into junctions and directory links
+                        if name not in (".", "..") and not attributes & _FILE_ATTRIBUTE_REPARSE_POINT:
+                            stack.append(os.path.join(directory, name))
+                    elif name.endswith(suffixes):
+                        key = None
+                        if not attributes & _FILE_ATTRIBUTE_REPARSE_POINT: # Links need a real stat
+                            mtime = data.ftLastWriteTime.dwHighDateTime << 32 | data.ftLastWriteTime.dwLowDateTime
+                            key = ((mtime - _EPOCH_AS_FILETIME) * 100,
+                                   data.nFileSizeHigh << 32 | data.nFileSizeLow)
+                        yield os.path.join(directory, name), name, key
+                    if not _FindNextFileW(handle, ctypes.byref(data)):
+                        break
+            finally:
+                _FindClose(handle)
+
+    try:
+        _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        _FindFirstFileExW = _kernel32.FindFirstFileExW
+        _FindFirstFileExW.argtypes = [wintypes.LPCWSTR, ctypes.c_int,
+                                      ctypes.POINTER(wintypes.WIN32_FIND_DATAW), ctypes.c_int,
+                                      ctypes.c_void_p, wintypes.DWORD]
+        _FindFirstFileExW.restype = wintypes.HANDLE
+        _FindNextFileW = _kernel32.FindNextFileW
+        _FindNextFileW.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.WIN32_FIND_DATAW)]
+        _FindNextFileW.restype = wintypes.BOOL
+        _FindClose = _kernel32.FindClose
+        _FindClose.argtypes = [wintypes.HANDLE]
+        _FindClose.restype = wintypes.BOOL
+        iter_files = _iter_findfirstfile
+    except (OSError, AttributeError):
+        pass
@@ -1,145 +1,1089 @@
+import io
+import mmap
+import operator
 import os
+import queue
 import re
+import sqlite3
 import sys
+import time
+import zlib
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
 from pypdf import PdfReader, PdfWriter
-from PyPDF2.generic import NameObject, createStringObject
+try:
+    import pymupdf  # Optional: MuPDF handles the files the tail reader can't much faster than pypdf
+except ImportError:
+    pymupdf = None
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import namedtuple
+from dataclasses import dataclass
 from functools import lru_cache
+from itertools import compress
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import _fastwalk
+
+# PDFs handed to a worker process per task
+_CHUNK_SIZE = 64
+# Threads per worker reading file tails ahead of the parser
+_PREFETCH_THREADS = 8
+# Scans with at most this many unindexed PDFs read them in-process, without a pool
+_INLINE_MAX = 32
+
+# Rewrites are written next to the original, then moved over it
+_TEMP_SUFFIX = ".temp.pdf"
+
+# On-disk metadata index shared across sessions
+_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".cache", "pdfmetaeditor", "index.sqlite")
+
+# Result tables larger than this are virtual: the tree only holds a window of
+# rows (resized to fit the widget) that is refilled as the user scrolls
+_VIRTUAL_ROWS_THRESHOLD = 5000
+_VIEW_ROWS = 60
+# Tree columns that can be edited in place: filename title and author
+_EDITABLE_COLS = frozenset(("#1", "#2"))
+
+# "Author - Title.pdf", matched case-insensitively like the .pdf filter in the walk
+_FN_RE = re.compile(r"(.+?) - (.+?)\.pdf$", re.IGNORECASE)
+
+# Metadata scans only need /Title and /Author, so instead of letting pypdf parse
+# the whole document we follow startxref -> trailer -> /Info directly.
+_TAIL_SIZE = 2048
+_WS = rb"[\x00\t\n\x0c\r ]"
+_REGULAR = rb"[^\x00\t\n\x0c\r ()<>\[\]{}/%]"
+_STARTXREF_RE = re.compile(rb"startxref" + _WS + rb"+(\d+)")
+_SKIP_RE = re.compile(rb"(?:" + _WS + rb"|%[^\r\n]*)*")
+_TOKEN_RE = re.compile(
+    rb"(?P<dict><<)|(?P<dictend>>>)|(?P<array>\[)|(?P<arrayend>\])"
+    rb"|(?P<hex><[0-9A-Fa-f\x00\t\n\x0c\r ]*>)|(?P<string>\()"
+    rb"|(?P<name>/" + _REGULAR + rb"*)|(?P<keyword>" + _REGULAR + rb"+)")
+_REF_TAIL_RE = re.compile(_WS + rb"+(\d+)" + _WS + rb"+R(?!" + _REGULAR + rb")")
+_OBJ_HEADER_RE = re.compile(_WS + rb"*(\d+)" + _WS + rb"+(\d+)" + _WS + rb"+obj")
+_XREF_SUBSECTION_RE = re.compile(_WS + rb"*(\d+)[ \t]+(\d+)[ \t]*(?:\r\n|\r|\n)")
+_XREF_ENTRY_RE = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_TRAILER_RE = re.compile(_WS + rb"*trailer")
+_STREAM_RE = re.compile(_WS + rb"*stream(?:\r\n|\n|\r)")
+_INT_RE = re.compile(rb"[+-]?\d+")
+_ESCAPES = {ord("n"): 0x0A, ord("r"): 0x0D, ord("t"): 0x09, ord("b"): 0x08,
+            ord("f"): 0x0C, ord("("): 0x28, ord(")"): 0x29, ord("\\"): 0x5C}
+# PDFDocEncoding only differs from Latin-1 in these two ranges
+_PDFDOC_TO_UNICODE = str.maketrans(dict(zip(
+    list(range(0x18, 0x20)) + list(range(0x80, 0xA1)),
+    "˘ˇˆ˙˝˛˚˜"
+    "•†‡…—–ƒ⁄‹›−"
+    "‰„“”‘’‚™ﬁﬂŁ"
+    "ŒŠŸŽıłœšž�€")))
+
+
+# Every casing of ".pdf", so the walk can use str.endswith without lowercasing names
+_PDF_SUFFIXES = tuple("." + p + d + f for p in "pP" for d in "dD" for f in "fF")
+
+_Ref = namedtuple("_Ref", "num gen")  # indirect reference `num gen R`
+
+
+def _parse_literal(buf, pos):
+    """Unescape a literal string whose opening paren ends just before pos."""
+    out = bytearray()
+    depth = 1
+    end = len(buf)
+    while pos < end:
+        c = buf[pos]
+        pos += 1
+        if c == 0x5C:  # backslash
+            if pos >= end:
+                break
+            c = buf[pos]
+            pos += 1
+            if c in _ESCAPES:
+                out.append(_ESCAPES[c])
+            elif 0x30 <= c <= 0x37:
+                value = c - 0x30
+                for _ in range(2):
+                    if pos < end and 0x30 <= buf[pos] <= 0x37:
+                        value = value * 8 + buf[pos] - 0x30
+                        pos += 1
+                out.append(value & 0xFF)
+            elif c == 0x0D:  # escaped line break is a continuation
+                if pos < end and buf[pos] == 0x0A:
+                    pos += 1
+            elif c != 0x0A:
+                out.append(c)
+        elif c == 0x28:
+            depth += 1
+            out.append(c)
+        elif c == 0x29:
+            depth -= 1
+            if depth == 0:
+                return bytes(out), pos
+            out.append(c)
+        elif c == 0x0D:
+            if pos < end and buf[pos] == 0x0A:
+                pos += 1
+            out.append(0x0A)
+        else:
+            out.append(c)
+    raise ValueError("unterminated string")
+
+
+def _parse_object(buf, pos):
+    """Parse the PDF object at pos and return (value, end).
+
+    Names come back as str, strings as bytes and references as _Ref.
+    """
+    pos = _SKIP_RE.match(buf, pos).end()
+    m = _TOKEN_RE.match(buf, pos)
+    if not m:
+        raise ValueError(f"unexpected token at {pos}")
+    kind, end = m.lastgroup, m.end()
+    if kind == "dict":
+        result = {}
+        while True:
+            end = _SKIP_RE.match(buf, end).end()
+            if buf[end:end + 2] == b">>":
+                return result, end + 2
+            key, end = _parse_object(buf, end)
+            if not isinstance(key, str) or not key.startswith("/"):
+                raise ValueError(f"bad dictionary key at {end}")
+            result[key], end = _parse_object(buf, end)
+    if kind == "array":
+        result = []
+        while True:
+            end = _SKIP_RE.match(buf, end).end()
+            if buf[end:end + 1] == b"]":
+                return result, end + 1
+            value, end = _parse_object(buf, end)
+            result.append(value)
+    if kind == "string":
+        return _parse_literal(buf, end)
+    if kind == "hex":
+        digits = re.sub(rb"[^0-9A-Fa-f]", b"", m.group())
+        if len(digits) % 2:
+            digits += b"0"
+        return bytes.fromhex(digits.decode("ascii")), end
+    if kind == "name":
+        return m.group().decode("latin-1"), end
+    if kind == "keyword":
+        token = m.group()
+        if _INT_RE.fullmatch(token):
+            ref = _REF_TAIL_RE.match(buf, end)
+            if ref:
+                return _Ref(int(token), int(ref.group(1))), ref.end()
+            return int(token), end
+        if token in (b"true", b"false"):
+            return token == b"true", end
+        if token == b"null":
+            return None, end
+        try:
+            return float(token), end
+        except ValueError:
+            raise ValueError(f"unexpected keyword {token!r}") from None
+    raise ValueError(f"unexpected token {m.group()!r}")
+
+
+def _decode_text(raw):
+    """Decode a PDF text string (UTF-16 with BOM, UTF-8 with BOM or PDFDocEncoding)."""
+    if raw[:2] in (b"\xfe\xff", b"\xff\xfe"):
+        return raw.decode("utf-16", "replace")
+    if raw[:3] == b"\xef\xbb\xbf":
+        return raw[3:].decode("utf-8", "replace")
+    return raw.decode("latin-1").translate(_PDFDOC_TO_UNICODE)
+
+
+def _find_startxref(buf, tail=None):
+    """Locate the last startxref offset within the final _TAIL_SIZE bytes (or a prefetched tail)."""
+    if tail is None:
+        tail = buf[max(0, len(buf) - _TAIL_SIZE):]
+    idx = tail.rfind(b"startxref")
+    m = _STARTXREF_RE.match(tail, idx) if idx >= 0 else None
+    if not m:
+        raise ValueError("startxref not found")
+    return int(m.group(1))
+
+
+def _read_xref_table(buf, offset):
+    """Return ([(first, count, entries_pos), ...], trailer) for the xref table at offset."""
+    if buf[offset:offset + 4] != b"xref":
+        raise ValueError("not a classic xref table")
+    pos = offset + 4
+    subsections = []
+    while True:
+        m = _XREF_SUBSECTION_RE.match(buf, pos)
+        if not m:
+            break
+        first, count = int(m.group(1)), int(m.group(2))
+        subsections.append((first, count, m.end()))
+        pos = m.end() + count * 20
+    m = _TRAILER_RE.match(buf, pos)
+    if not m:
+        raise ValueError("trailer not found")
+    trailer, _ = _parse_object(buf, m.end())
+    if not isinstance(trailer, dict):
+        raise ValueError("bad trailer")
+    return subsections, trailer
+
+
+def _read_trailer(buf, offset):
+    """Return (is_xref_stream, trailer) for the cross-reference section at offset.
+
+    For an xref stream the trailer keys live in the stream dictionary, which is
+    all that is needed here, so the stream data itself is not decoded.
+    """
+    if buf[offset:offset + 4] == b"xref":
+        return False, _read_xref_table(buf, offset)[1]
+    m = _OBJ_HEADER_RE.match(buf, offset)
+    if m:
+        stream_dict, _ = _parse_object(buf, m.end())
+        if isinstance(stream_dict, dict) and stream_dict.get("/Type") == "/XRef":
+            return True, stream_dict
+    raise ValueError("no cross-reference section at startxref")
+
+
+def _undo_png_predictor(data, columns):
+    """Reverse the PNG row filters of Predictor >= 10 for one byte per pixel."""
+    out = bytearray()
+    prev = bytearray(columns)
+    for start in range(0, len(data) - columns, columns + 1):
+        kind = data[start]
+        row = bytearray(data[start + 1:start + 1 + columns])
+        if kind == 1:  # Sub
+            for i in range(1, columns):
+                row[i] = (row[i] + row[i - 1]) & 0xFF
+        elif kind == 2:  # Up
+            for i in range(columns):
+                row[i] = (row[i] + prev[i]) & 0xFF
+        elif kind == 3:  # Average
+            for i in range(columns):
+                row[i] = (row[i] + ((row[i - 1] if i else 0) + prev[i]) // 2) & 0xFF
+        elif kind == 4:  # Paeth
+            for i in range(columns):
+                a, b, c = (row[i - 1], prev[i], prev[i - 1]) if i else (0, prev[i], 0)
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                row[i] = (row[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xFF
+        elif kind != 0:
+            raise ValueError(f"unknown PNG predictor {kind}")
+        out += row
+        prev = row
+    return bytes(out)
+
+
+def _read_stream(buf, pos, stream_dict):
+    """Decoded data of the stream whose dictionary ends at pos (unfiltered or Flate only)."""
+    m = _STREAM_RE.match(buf, pos)
+    length = stream_dict.get("/Length")
+    if not m or not isinstance(length, int):
+        raise ValueError(f"no stream data at {pos}")
+    data = buf[m.end():m.end() + length]
+    filters, params = stream_dict.get("/Filter"), stream_dict.get("/DecodeParms")
+    if isinstance(filters, list):
+        if len(filters) > 1:
+            raise ValueError("chained stream filters")
+        filters = filters[0] if filters else None
+        params = params[0] if isinstance(params, list) and params else None
+    if filters is None:
+        return data
+    if filters != "/FlateDecode":
+        raise ValueError(f"unsupported stream filter {filters}")
+    try:
+        data = zlib.decompress(data)
+    except zlib.error as e:
+        raise ValueError(f"bad Flate data: {e}") from None
+    if isinstance(params, dict) and params.get("/Predictor", 1) > 1:
+        if (params["/Predictor"] < 10 or params.get("/Colors", 1) != 1
+                or params.get("/BitsPerComponent", 8) != 8):
+            raise ValueError("unsupported predictor")
+        data = _undo_png_predictor(data, params.get("/Columns", 1))
+    return data
+
+
+def _xref_stream_entry(buf, offset, num):
+    """Look up object num in the xref stream at offset.
+
+    Returns (found, entry, stream_dict); entry is as for _lookup_offset. Only
+    the row for num is decoded, located from /Index and /W.
+    """
+    m = _OBJ_HEADER_RE.match(buf, offset)
+    if not m:
+        raise ValueError(f"no xref stream at {offset}")
+    stream_dict, end = _parse_object(buf, m.end())
+    if not isinstance(stream_dict, dict) or stream_dict.get("/Type") != "/XRef":
+        raise ValueError(f"no xref stream at {offset}")
+    widths = stream_dict.get("/W")
+    index = stream_dict.get("/Index", [0, stream_dict.get("/Size")])
+    if (not isinstance(widths, list) or len(widths) != 3 or not isinstance(index, list)
+            or not all(isinstance(n, int) and n >= 0 for n in widths + index)):
+        raise ValueError("bad xref stream dictionary")
+    row = 0  # Rows before the subsection holding num
+    for first, count in zip(index[::2], index[1::2]):
+        if first <= num < first + count:
+            row += num - first
+            break
+        row += count
+    else:
+        return False, None, stream_dict
+
+    data = _read_stream(buf, end, stream_dict)
+    w0, w1, w2 = widths
+    pos = row * (w0 + w1 + w2)
+    if pos + w0 + w1 + w2 > len(data):
+        raise ValueError("xref stream too short")
+    kind = int.from_bytes(data[pos:pos + w0], "big") if w0 else 1
+    field2 = int.from_bytes(data[pos + w0:pos + w0 + w1], "big")
+    field3 = int.from_bytes(data[pos + w0 + w1:pos + w0 + w1 + w2], "big")
+    if kind == 1:
+        return True, field2, stream_dict
+    if kind == 2:
+        return True, (field2, field3), stream_dict
+    return True, None, stream_dict  # Free, or a reserved type read as null
+
+
+def _lookup_offset(buf, startxref, num):
+    """Follow the xref chain from startxref to where object num is stored.
+
+    Returns its byte offset, a (stream_num, index) pair for an object inside
+    an object stream, or None if it is free or missing.
+    """
+    offset, seen = startxref, set()
+    while isinstance(offset, int):
+        if offset in seen:
+            raise ValueError("xref loop")
+        seen.add(offset)
+        if buf[offset:offset + 4] == b"xref":
+            subsections, trailer = _read_xref_table(buf, offset)
+            for first, count, pos in subsections:
+                if first <= num < first + count:
+                    m = _XREF_ENTRY_RE.match(buf, pos + (num - first) * 20)
+                    if not m:
+                        raise ValueError("malformed xref entry")
+                    return int(m.group(1)) if m.group(3) == b"n" else None
+            # Hybrid files list their compressed objects in a separate xref stream
+            if isinstance(trailer.get("/XRefStm"), int):
+                found, entry, _ = _xref_stream_entry(buf, trailer["/XRefStm"], num)
+                if found:
+                    return entry
+        else:
+            found, entry, trailer = _xref_stream_entry(buf, offset, num)
+            if found:
+                return entry
+        offset = trailer.get("/Prev")
+    return None
+
+
+def _read_from_object_stream(buf, startxref, stream_num, index, num):
+    """Parse object num, stored at position index of object stream stream_num."""
+    offset = _lookup_offset(buf, startxref, stream_num)
+    m = _OBJ_HEADER_RE.match(buf, offset) if isinstance(offset, int) else None
+    if not m or int(m.group(1)) != stream_num:
+        raise ValueError(f"object stream {stream_num} not found")
+    stream_dict, end = _parse_object(buf, m.end())
+    if not isinstance(stream_dict, dict) or stream_dict.get("/Type") != "/ObjStm":
+        raise ValueError(f"object {stream_num} is not an object stream")
+    first, count = stream_dict.get("/First"), stream_dict.get("/N")
+    if not isinstance(first, int) or not isinstance(count, int):
+        raise ValueError("bad object stream dictionary")
+    data = _read_stream(buf, end, stream_dict)
+    # The header holds `num offset` pairs, index normally points right at ours
+    header = list(map(int, _INT_RE.findall(data, 0, first)))[:2 * count]
+    for i in [index] + list(range(len(header) // 2)):
+        if 2 * i + 1 < len(header) and header[2 * i] == num:
+            return _parse_object(data, first + header[2 * i + 1])[0]
+    raise ValueError(f"object {num} not in object stream {stream_num}")
+
+
+def _resolve(buf, startxref, value):
+    """Dereference value if it is an indirect reference."""
+    if not isinstance(value, _Ref):
+        return value
+    offset = _lookup_offset(buf, startxref, value.num)
+    if offset is None:
+        return None
+    if isinstance(offset, tuple):
+        return _read_from_object_stream(buf, startxref, *offset, value.num)
+    m = _OBJ_HEADER_RE.match(buf, offset)
+    if not m or int(m.group(1)) != value.num:
+        raise ValueError(f"object {value.num} not at offset {offset}")
+    return _parse_object(buf, m.end())[0]
+
+
+def _fast_read_info(path, tail=None):
+    """Read (title, author, startxref) by visiting only the trailer and the Info dict.
+
+    Both xref tables and xref streams are followed, and objects inside Flate
+    object streams are read by decoding just that stream. tail may hold the
+    file's last bytes as read by _read_tail. Raises ValueError on layouts it
+    does not handle (encryption, other filters, damaged tables) so the caller
+    can fall back to a full parser.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        startxref = _find_startxref(buf, tail)
+        _, trailer = _read_trailer(buf, startxref)
+        if "/Encrypt" in trailer:
+            raise ValueError("encrypted")
+        info = _resolve(buf, startxref, trailer.get("/Info"))
+        if not isinstance(info, dict):
+            return "", "", startxref
+        fields = []
+        for key in ("/Title", "/Author"):
+            value = _resolve(buf, startxref, info.get(key))
+            fields.append(_decode_text(value) if isinstance(value, bytes) else "")
+        return fields[0], fields[1], startxref
+
+
+def _serialize(value):
+    """Serialize a value produced by _parse_object back to PDF syntax."""
+    if isinstance(value, dict):
+        return b"<<" + b"".join(key.encode("latin-1") + b" " + _serialize(v)
+                                for key, v in value.items()) + b">>"
+    if isinstance(value, list):
+        return b"[" + b" ".join(_serialize(v) for v in value) + b"]"
+    if isinstance(value, _Ref):
+        return b"%d %d R" % value
+    if isinstance(value, str):  # name
+        return value.encode("latin-1")
+    if isinstance(value, bytes):
+        return b"<" + value.hex().encode("ascii") + b">"
+    if isinstance(value, bool):
+        return b"true" if value else b"false"
+    if value is None:
+        return b"null"
+    if isinstance(value, float):
+        return (b"%f" % value).rstrip(b"0").rstrip(b".")
+    return b"%d" % value
+
+
+def _encode_text(text):
+    """Serialize text as a literal string if ASCII, else as UTF-16BE hex with BOM."""
+    if text.isascii():
+        escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        return b"(" + escaped.replace("\r", "\\r").encode("ascii") + b")"
+    return b"<FEFF" + text.encode("utf-16-be").hex().upper().encode("ascii") + b">"
+
+
+def _info_fields(buf, startxref, info_ref, path):
+    """Existing Info entries as {key: serialized value}.
+
+    Info dicts the tail reader can't reach (unsupported filters, damaged
+    sections) are looked up through pypdf, which only loads the xref and that
+    one object.
+    """
+    try:
+        info = _resolve(buf, startxref, info_ref)
+    except ValueError:
+        try:
+            info = PdfReader(path).trailer["/Info"].get_object()
+            fields = {}
+            for key, value in info.items():
+                out = io.BytesIO()
+                value.write_to_stream(out)
+                fields[key] = out.getvalue()
+        except Exception as e:
+            # Damaged beyond what pypdf reads either, leave it to the rewrite
+            raise ValueError(f"unreadable Info dict: {e}") from e
+        return fields
+    if not isinstance(info, dict):
+        return {}
+    return {key: _serialize(value) for key, value in info.items()}
+
+
+def _incremental_update_info(path, title, author, startxref=None):
+    """Append an incremental update that replaces only the Info dict.
+
+    The original bytes are left untouched; a new Info object and a one-entry
+    cross-reference section chained via /Prev are appended, as an xref table
+    or an xref stream to match the file. startxref may be passed in when it
+    is known from an earlier read of the unchanged file. Returns the new
+    startxref. Raises ValueError on layouts it does not handle so the caller
+    can rewrite.
+    """
+    with open(path, "r+b") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if startxref is None:
+                startxref = _find_startxref(buf)
+            xref_stream, trailer = _read_trailer(buf, startxref)
+            if "/Encrypt" in trailer:
+                raise ValueError("encrypted")
+            size, root = trailer.get("/Size"), trailer.get("/Root")
+            if not isinstance(size, int) or not isinstance(root, _Ref):
+                raise ValueError("incomplete trailer")
+            info_ref = trailer.get("/Info")
+            if isinstance(info_ref, _Ref):
+                # Keep the other Info entries (Producer, dates, custom keys)
+                fields = _info_fields(buf, startxref, info_ref, path)
+            else:
+                fields = {}
+                info_ref = _Ref(size, 0)
+                size += 1
+            file_end = len(buf)
+            needs_eol = buf[file_end - 1:file_end] not in (b"\n", b"\r")
+
+        fields["/Title"] = _encode_text(title)
+        fields["/Author"] = _encode_text(author)
+        body = b" ".join(key.encode("latin-1") + b" " + value for key, value in fields.items())
+
+        obj_offset = file_end + needs_eol
+        update = b"%d %d obj\n<<%s>>\nendobj\n" % (info_ref.num, info_ref.gen, body)
+        xref_offset = obj_offset + len(update)
+
+        if xref_stream:
+            # The xref stream is an object itself and needs an entry of its own
+            xref_num = size
+            size += 1
+            new_trailer = {"/Type": "/XRef", "/Size": size, "/Root": root, "/Info": info_ref,
+                           "/Prev": startxref}
+            if "/ID" in trailer:
+                new_trailer["/ID"] = trailer["/ID"]
+            width = max(4, (xref_offset.bit_length() + 7) // 8)
+            entries = sorted([(info_ref.num, obj_offset, info_ref.gen), (xref_num, xref_offset, 0)])
+            data = b"".join(b"\x01" + offset.to_bytes(width, "big") + gen.to_bytes(2, "big")
+                            for _, offset, gen in entries)
+            new_trailer["/W"] = [1, width, 2]
+            new_trailer["/Index"] = [n for num, _, _ in entries for n in (num, 1)]
+            new_trailer["/Length"] = len(data)
+            update += b"%d 0 obj\n%s\nstream\n%s\nendstream\nendobj\n" % (
+                xref_num, _serialize(new_trailer), data)
+        else:
+            new_trailer = {"/Size": size, "/Root": root, "/Info": info_ref, "/Prev": startxref}
+            if "/ID" in trailer:
+                new_trailer["/ID"] = trailer["/ID"]
+            update += b"xref\n%d 1\n%010d %05d n\r\n" % (info_ref.num, obj_offset, info_ref.gen)
+            update += b"trailer\n%s\n" % _serialize(new_trailer)
+        update += b"startxref\n%d\n%%%%EOF\n" % xref_offset
+
+        f.seek(0, os.SEEK_END)
+        f.write(b"\n" * needs_eol + update)
+    return xref_offset
+
+
+def _rewrite_info(path, title, author, durable=False):
+    """Fallback for files the incremental update can't handle (encrypted or
+    damaged ones). Uses PyMuPDF when installed, else a full pypdf rewrite.
+
+    With durable=True the written file is fsynced before it is returned.
+    Returns the temp file the caller has to os.replace over path, or None
+    if path was updated in place.
+    """
+    temp_path = path + _TEMP_SUFFIX
+    if pymupdf is not None:
+        with pymupdf.open(path) as doc:
+            if doc.needs_pass:
+                raise ValueError("password protected")
+            metadata = doc.metadata
+            metadata.update(title=title, author=author)
+            doc.set_metadata(metadata)
+            # MuPDF can append just the changed Info object to the original,
+            # repaired files have to be written out in full
+            in_place = doc.can_save_incrementally()
+            if in_place:
+                doc.save(path, incremental=True, encryption=pymupdf.PDF_ENCRYPT_KEEP)
+            else:
+                doc.save(temp_path, deflate=True, encryption=pymupdf.PDF_ENCRYPT_KEEP)
+        written = path if in_place else temp_path
+        if durable:
+            fd = os.open(written, os.O_RDWR)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        return None if in_place else temp_path
+
+    # Cloning takes the document over as is instead of re-adding every page
+    writer = PdfWriter(clone_from=path)
+    writer.add_metadata({
+        "/Title": title,
+        "/Author": author
+    })
+
+    # pypdf issues many small writes, coalesce them into ~1 MB syscalls
+    with open(temp_path, "wb", buffering=0) as raw, io.BufferedWriter(raw, buffer_size=1 << 20) as f:
+        writer.write(f)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+
+    return temp_path
+
+
+def _iter_pdfs(folder):
+    """Yield (path, filename, stat_key) for every PDF below folder via the fastest native walk.
+
+    stat_key is (mtime_ns, size) when the walk got it along with the entry, else None.
+    """
+    return _fastwalk.iter_files(folder, _PDF_SUFFIXES)
+
+
+def _read_tail(path):
+    """Read the last _TAIL_SIZE bytes of path, or None if it can't be read"""
+    try:
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - _TAIL_SIZE))
+            return f.read()
+    except OSError:
+        return None
+
+
+def _parse_info(path):
+    """(title, author) through PyMuPDF if installed, else pypdf"""
+    if pymupdf is not None:
+        with pymupdf.open(path) as doc:
+            metadata = doc.metadata or {}
+            return metadata.get("title") or "", metadata.get("author") or ""
+    # A file object keeps pypdf from copying the whole file into memory first,
+    # and reading /Info from the trailer avoids resolving anything else
+    with open(path, "rb") as f:
+        info = PdfReader(f, strict=False).trailer.get("/Info")
+        info = info.get_object() if info is not None else {}
+        fields = []
+        for key in ("/Title", "/Author"):
+            value = info.get(key)
+            value = value.get_object() if value is not None else None
+            fields.append(value if isinstance(value, str) else "")
+        return fields[0], fields[1]
+
+
+def _read_pdf_metadata(path, tail=None, full_parse=True):
+    """Safe PDF metadata extraction, returns (title, author, startxref).
+
+    startxref is None unless the tail reader handled the file. Returns None
+    if the file couldn't be read, so callers don't cache an error (a locked
+    file or a share hiccup) as empty metadata. With full_parse=False files
+    the tail reader can't handle raise ValueError instead of being handed to
+    the full parser.
+    """
+    try:
+        title, author, startxref = _fast_read_info(path, tail)
+    except ValueError:
+        if not full_parse:
+            raise
+        # Layout the tail reader doesn't handle, let a full parser read it
+        try:
+            title, author = _parse_info(path)
+        except Exception as e:
+            print(f"Error reading {path}: {e}")
+            return None
+        startxref = None
+    except Exception as e:
+        print(f"Error reading {path}: {e}")
+        return None
+    return title.strip(), author.strip(), startxref
+
+
+@lru_cache(maxsize=4096)
+def _parse_filename(filename):
+    """(author, title) from an "Author - Title.pdf" name, else ("", name without extension)"""
+    match = _FN_RE.match(filename)
+    if match:
+        return match.group(1).strip(), match.group(2).strip()
+    return "", os.path.splitext(filename)[0]
+
+
+def _process_single_pdf(file_info, meta=None):
+    """Process a single PDF file - runs in a worker process unless meta is already cached.
+
+    Returns a (path, filename, fn_title, fn_author, meta_title, meta_author) row.
+    """
+    full_path, filename = file_info
+
+    fn_author, fn_title = _parse_filename(filename)
+    if meta is None:
+        meta = (_read_pdf_metadata(full_path) or ("", ""))[:2]
+    meta_title, meta_author = meta
+
+    return full_path, filename, fn_title, fn_author, meta_title, meta_author
+
+
+def _process_chunk(chunk):
+    """Process a batch of PDFs in one worker task, amortizing IPC over the batch.
+
+    Returns (row, info) pairs, info being _read_pdf_metadata's result so the
+    parent can cache where the xref is, or None if the file couldn't be read.
+    """
+    # Reader threads fetch the tails of the whole chunk ahead of the parser, so
+    # seek latency on slow disks and shares overlaps with parsing earlier files
+    with ThreadPoolExecutor(max_workers=_PREFETCH_THREADS) as prefetch:
+        tails = prefetch.map(_read_tail, [file_info[0] for file_info in chunk])
+        results = []
+        for file_info, tail in zip(chunk, tails):
+            info = _read_pdf_metadata(file_info[0], tail)
+            meta = info[:2] if info is not None else ("", "")
+            results.append((_process_single_pdf(file_info, meta), info))
+        return results
+
+
+def _process_one_by_one(files):
+    """Read files one per task in a worker, for files that may crash it.
+
+    Used for files whose chunk was lost to a crashed worker, and for the
+    few files of a small scan that need the full parser.
+
+    A single worker runs the tasks in order, so when it dies (MuPDF on a
+    damaged file, say) the first unfinished task is the file that killed it.
+    That file is reported as unreadable and the rest go to a fresh worker.
+    """
+    results = []
+    while files:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            futures = [executor.submit(_process_chunk, [file_info]) for file_info in files]
+            for i, future in enumerate(futures):
+                try:
+                    results.extend(future.result())
+                except Exception as e:
+                    print(f"Error reading {files[i][0]}: {e}")
+                    results.append((_process_single_pdf(files[i], ("", "")), None))
+                    if isinstance(e, BrokenProcessPool):
+                        files = files[i + 1:]
+                        break
+            else:
+                files = []
+    return results
+
+
+def _fsync_dirs(dirs):
+    """fsync each directory once so renames into it survive a crash"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows can't open directories, NTFS journals renames itself
+    for directory in dirs:
+        try:
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _discard_temp(path):
+    """Remove a rewrite of path left behind by a failed update, the scan would list it as a PDF"""
+    try:
+        os.remove(path + _TEMP_SUFFIX)
+    except OSError:
+        pass
+
+
+def _update_single(job, rewrite=True):
+    """Write one (path, title, author, startxref) update - runs in a worker process unless rewrite=False.
+
+    Returns (mtime_ns, size, startxref, temp_path) of the written file, or None
+    on failure. A rewritten file is left at temp_path for the caller to move into
+    place, temp_path is None when the original was updated in place. With
+    rewrite=False files the incremental update can't handle are left alone
+    and False is returned for them.
+    """
+    path, title, author, startxref = job
+    try:
+        temp_path = None
+        try:
+            startxref = _incremental_update_info(path, title, author, startxref)
+        except ValueError:
+            if not rewrite:
+                return False
+            # Synced here so the data is on disk before the parent renames it in
+            temp_path = _rewrite_info(path, title, author, durable=True)
+            startxref = None
+        # os.replace keeps the temp file's mtime and size
+        st = os.stat(temp_path or path)
+        return st.st_mtime_ns, st.st_size, startxref, temp_path
+    except Exception as e:
+        print(f"Failed to update {path}: {e}")
+        _discard_temp(path)
+        return None
+
+
+@dataclass
+class CachedPdf:
+    """Session cache entry, valid while the file's mtime and size are unchanged"""
+    mtime: int
+    size: int
+    title: str
+    author: str
+    xref_offset: int = None  # startxref from the last read or write, None if unknown
+
+
+class MetadataIndex:
+    """Persistent (path, mtime, size) -> (title, author) index so rescans skip unchanged PDFs"""
+
+    def __init__(self, db_path=_INDEX_PATH):
+        self._lock = threading.Lock()  # Shared by the scan thread and the UI thread
+        try:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self._conn = sqlite3.connect(db_path, timeout=5, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS pdfs (path TEXT PRIMARY KEY, "
+                               "mtime INTEGER, size INTEGER, title TEXT, author TEXT)")
+            self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Metadata index unavailable, every scan will read all PDFs: {e}")
+            self._conn = None
+
+    def load_folder(self, folder):
+        """Return {path: (mtime, size, title, author)} for every indexed path below folder"""
+        if self._conn is None:
+            return {}
+        # A range over the primary key instead of LIKE, which can't use the index
+        # and treats _ and % in folder names as wildcards
+        prefix = os.path.join(folder, "")
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT path, mtime, size, title, author FROM pdfs WHERE path >= ? AND path < ?",
+                    (prefix, upper)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Metadata index lookup failed for {folder}: {e}")
+            return {}
+        return {row[0]: row[1:] for row in rows}
+
+    def store(self, rows):
+        """Insert or replace (path, mtime, size, title, author) rows in one transaction"""
+        if self._conn is None or not rows:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO pdfs VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            print(f"Failed to update metadata index: {e}")
+
 
 class PDFMetadataEditor:
     def __init__(self):
-        self.pdf_cache = {}
+        self.pdf_cache = {} # path -> CachedPdf
+        self.index = MetadataIndex()
         self.folders = []
         self.current_popup = None # To store a reference to the current popup window
+        self._last_ui = 0.0 # Monotonic time of the last progress redraw
+        self._last_pct = -1 # Whole percentage shown by the last progress redraw
+        self._mismatch_iids = set() # Tree rows whose filename fields differ from the metadata
 
-    @lru_cache(maxsize=1000)
-    def extract_metadata_from_filename(self, filename):
-        """Cached filename parsing"""
-        match = re.match(r"(.+?) - (.+?)\.pdf$", filename)
-        if match:
-            return match.group(1).strip(), match.group(2).strip()
-        return "", os.path.splitext(filename)[0]
+    def cached_metadata(self, path, mtime, size):
+        """(title, author) from the cache if path is unchanged, else None.
 
-    def extract_metadata_from_pdf_safe(self, path):
-        """Safe PDF metadata extraction with caching"""
-        if path in self.pdf_cache:
-            return self.pdf_cache[path]
-
-        try:
-            reader = PdfReader(path)
-            info = reader.metadata
-            result = (info.get("/Title", "").strip(), info.get("/Author", "").strip())
-            self.pdf_cache[path] = result
-            return result
-        except Exception as e:
-            print(f"Error reading {path}: {e}")
-            result = ("", "")
-            self.pdf_cache[path] = result
-            return result
-
-    def process_single_pdf(self, file_info):
-        """Process a single PDF file - designed for threading"""
-        root, filename = file_info
-        full_path = os.path.join(root, filename)
-
-        fn_author, fn_title = self.extract_metadata_from_filename(filename)
-        meta_title, meta_author = self.extract_metadata_from_pdf_safe(full_path)
-
-        return {
-            "path": full_path,
-            "filename": filename,
-            "fn_title": fn_title,
-            "fn_author": fn_author,
-            "meta_title": meta_title,
-            "meta_author": meta_author
-        }
+        Scans load the folder's index rows into the cache before walking it.
+        """
+        cached = self.pdf_cache.get(path)
+        if cached is not None and (cached.mtime, cached.size) == (mtime, size):
+            return cached.title, cached.author
+        return None
 
     def collect_pdfs_recursively(self, folder, progress_callback=None):
-        """Threaded PDF collection with progress updates"""
+        """Multiprocess PDF collection with progress updates.
+
+        Paths are streamed from the walk: unchanged files are answered from
+        the cache right away and changed ones go to worker processes in chunks
+        while the walk is still running. The progress total grows as PDFs are
+        found.
+        """
         pdf_files = []
-        file_list = []
+        index_rows = []
+        stats = {}
+        found = completed = 0
 
         print(f"Scanning for PDFs in: {folder}")
 
-        # First pass: collect all PDF file paths (fast)
-        for root, _, files in os.walk(folder):
-            for f in files:
-                if f.lower().endswith(".pdf"):
-                    file_list.append((root, f))
-
-        if not file_list:
-            return pdf_files
-
-        print(f"Found {len(file_list)} PDF files, processing metadata...")
-
-        # Second pass: process metadata in parallel
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            future_to_file = {executor.submit(self.process_single_pdf, file_info): file_info
-                             for file_info in file_list}
-
-            completed = 0
-            for future in as_completed(future_to_file):
+        # One query for the whole folder up front rather than one per file in the walk
+        for path, row in self.index.load_folder(folder).items():
+            if path not in self.pdf_cache:
+                self.pdf_cache[path] = CachedPdf(*row)
+
+        def add_results(results):
+            nonlocal completed
+            for row, info in results:
+                path, _, _, _, meta_title, meta_author = row
+                key = stats.pop(path, None)
+                # Failed reads are shown empty but not cached, the next scan retries them
+                if key is not None and info is not None:
+                    self.pdf_cache[path] = CachedPdf(*key, meta_title, meta_author, info[2])
+                    index_rows.append((path,) + key + (meta_title, meta_author))
+                pdf_files.append(row)
+            completed += len(results)
+
+            if progress_callback:
+                progress_callback(completed, found)
+
+        # Parsing is CPU-bound Python, so worker processes scale where threads
+        # would serialize on the GIL. Windows caps process pools at 61 workers.
+        workers = min(os.cpu_count() or 1, 61)
+        executor = None
+        future_to_chunk = {}
+        retry = [] # Files of chunks that failed as a whole, re-read one by one at the end
+
+        def submit(chunk):
+            nonlocal executor
+            if executor is None:
+                executor = ProcessPoolExecutor(max_workers=workers)
+            try:
+                future = executor.submit(_process_chunk, chunk)
+            except BrokenProcessPool:
+                # A worker crashed and took the pool with it, carry on in a fresh one
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=workers)
+                future = executor.submit(_process_chunk, chunk)
+            future_to_chunk[future] = chunk
+
+        def collect_finished(futures):
+            for future in futures:
+                chunk = future_to_chunk.pop(future)
                 try:
-                    result = future.result()
-                    pdf_files.append(result)
-                    completed += 1
-
-                    if progress_callback:
-                        progress_callback(completed, len(file_list))
-
+                    add_results(future.result())
                 except Exception as e:
-                    file_info = future_to_file[future]
-                    print(f"Error processing {file_info}: {e}")
+                    print(f"Error processing {len(chunk)} files from {chunk[0][0]}, retrying them one by one: {e}")
+                    retry.extend(chunk)
 
+        pending = []
+        queued = 0  # Changed files seen so far, sizes the next chunk
+        try:
+            for path, filename, key in _iter_pdfs(folder):
+                found += 1
+                file_info = (path, filename)
+                # The walk usually delivers mtime and size with the entry, stat only if it didn't
+                if key is None:
+                    try:
+                        st = os.stat(path)
+                        key = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        pass  # The worker will report the error
+                # Files unchanged since they were last read don't need a worker
+                cached = None
+                if key is not None:
+                    stats[path] = key
+                    cached = self.cached_metadata(path, *key)
+                if cached is not None:
+                    del stats[path]
+                    pdf_files.append(_process_single_pdf(file_info, cached))
+                    completed += 1
+                    if progress_callback and completed % _CHUNK_SIZE == 0:
+                        progress_callback(completed, found)
+                    continue
+                pending.append(file_info)
+                queued += 1
+
+                # A few changed files are read in-process at the end, starting
+                # worker processes would take longer than the reads themselves
+                if executor is None and queued <= _INLINE_MAX:
+                    continue
+                # Chunks start small so every worker gets busy early, then grow
+                # to _CHUNK_SIZE to amortize IPC once there is enough work queued
+                chunk_size = max(1, min(_CHUNK_SIZE, queued // workers))
+                if len(pending) >= chunk_size:
+                    for i in range(0, len(pending), chunk_size):
+                        submit(pending[i:i + chunk_size])
+                    pending = []
+                    collect_finished([f for f in future_to_chunk if f.done()])
+
+            if not found:
+                return pdf_files
+            print(f"Found {found} PDF files, processing metadata...")
+            if executor is None:
+                # Only the tail reader runs in-process. Files it can't handle go to a
+                # worker, since MuPDF can take the process down on a damaged file and
+                # here that would be the GUI along with any unsaved edits.
+                results = []
+                deferred = []
+                for file_info in pending:
+                    try:
+                        info = _read_pdf_metadata(file_info[0], full_parse=False)
+                    except ValueError:
+                        deferred.append(file_info)
+                        continue
+                    meta = info[:2] if info is not None else ("", "")
+                    results.append((_process_single_pdf(file_info, meta), info))
+                add_results(results)
+                if deferred:
+                    add_results(_process_one_by_one(deferred))
+            else:
+                # Spread what is left of the walk over the workers
+                chunk_size = max(1, -(-len(pending) // workers))
+                for i in range(0, len(pending), chunk_size):
+                    submit(pending[i:i + chunk_size])
+                collect_finished(as_completed(list(future_to_chunk)))
+                if retry:
+                    add_results(_process_one_by_one(retry))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.index.store(index_rows)
         return pdf_files
 
     def update_pdf_metadata_batch(self, updates):
-        """Batch update PDF metadata with threading"""
-        def update_single(update_info):
-            path, title, author = update_info
+        """Batch update PDF metadata in worker processes, returns the paths that were updated"""
+        jobs = []
+        for path, title, author in updates:
+            # Reuse the xref offset from the scan if the file hasn't changed since
+            startxref = None
+            cached = self.pdf_cache.get(path)
+            if cached is not None and cached.xref_offset is not None:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    pass  # The update will report it
+                else:
+                    if (st.st_mtime_ns, st.st_size) == (cached.mtime, cached.size):
+                        startxref = cached.xref_offset
+            jobs.append((path, title, author, startxref))
+
+        # Like scans, a few files get the incremental update in-process rather than
+        # starting a pool. Rewrites always run in workers: they serialize whole
+        # documents and are CPU-bound, and MuPDF can crash on a damaged file.
+        # Pools are capped at 8 since beyond that the disk is the bottleneck.
+        if len(jobs) <= _INLINE_MAX:
+            results = [_update_single(job, rewrite=False) for job in jobs]
+            remote = [i for i, result in enumerate(results) if result is False]
+        else:
+            results = [None] * len(jobs)
+            remote = range(len(jobs))
+        if remote:
+            with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, 8, len(remote))) as executor:
+                future_to_job = {executor.submit(_update_single, jobs[i]): i for i in remote}
+                for future in as_completed(future_to_job):
+                    i = future_to_job[future]
+                    try:
+                        results[i] = future.result()
+                    except Exception as e:
+                        # A crashed worker fails every job that hadn't finished, count them
+                        # as failed and drop any rewrite they left half written
+                        print(f"Failed to update {jobs[i][0]}: {e}")
+                        _discard_temp(jobs[i][0])
+                        results[i] = None
+
+        # Workers sync rewritten files before returning them. They are moved into
+        # place only once every write is done, then each directory is synced once
+        # to persist its renames rather than once per file
+        dirs = set()
+        for i, ((path, _, _, _), result) in enumerate(zip(jobs, results)):
+            if result is None or result[3] is None:
+                continue
             try:
-                reader = PdfReader(path)
-                writer = PdfWriter()
-
-                for page in reader.pages:
-                    writer.add_page(page)
-
-                writer.add_metadata({
-                    "/Title": title,
-                    "/Author": author
-                })
-
-                writer._root_object.update({
-                    NameObject("/Pages"): writer._pages
-                })
-
-                temp_path = path + ".temp.pdf"
-                with open(temp_path, "wb") as f:
-                    writer.write(f)
-
-                os.replace(temp_path, path)
-
-                # Update cache
-                self.pdf_cache[path] = (title, author)
-                return True
-            except Exception as e:
+                os.replace(result[3], path)
+            except OSError as e:
                 print(f"Failed to update {path}: {e}")
-                return False
-
-        successful_updates = 0
-        with ThreadPoolExecutor(max_workers=2) as executor:  # Fewer workers for writing
-            futures = [executor.submit(update_single, update) for update in updates]
-            for future in as_completed(futures):
-                if future.result():
-                    successful_updates += 1
-
-        return successful_updates
+                results[i] = None
+                _discard_temp(path)
+                continue
+            dirs.add(os.path.dirname(os.path.abspath(path)))
+        _fsync_dirs(dirs)
+
+        # The workers can't see the caches, refresh them here keyed by the new mtime
+        # and size so the next scan hits them
+        updated_paths = []
+        index_rows = []
+        for (path, title, author, _), result in zip(jobs, results):
+            if result is None:
+                continue
+            mtime, size, startxref, _ = result
+            self.pdf_cache[path] = CachedPdf(mtime, size, title, author, startxref)
+            index_rows.append((path, mtime, size, title, author))
+            updated_paths.append(path)
+
+        self.index.store(index_rows)
+        return updated_paths
 
     def browse_folders(self):
         # Modified: Only allow selection of a single folder at a time
+        # An empty folder is reported by the scan, which asks again from the Tk loop
         folder = filedialog.askdirectory(title="Select Folder Containing PDFs")
         if not folder:
             sys.exit(0) # Exit if no folder selected
@@ -159,38 +1103,70 @@ class PDFMetadataEditor:
 
         tk.Label(progress_window, text="Scanning folders for PDF files...", font=('Arial', 10), bg="#333333", fg="#D3D3D3").pack(pady=10)
         
-        progress_var = tk.DoubleVar()
-        progress_bar = ttk.Progressbar(progress_window, variable=progress_var, maximum=100)
+        progress_bar = ttk.Progressbar(progress_window, maximum=100)
         progress_bar.pack(pady=10, padx=20, fill="x")
 
         status_label = tk.Label(progress_window, text="Initializing...", font=('Arial', 9), bg="#333333", fg="#D3D3D3")
         status_label.pack(pady=5)
 
-        pdf_data = []
+        self._last_pct = -1
+        # The scan thread never touches widgets, it posts events the Tk loop drains
+        events = queue.Queue()
 
         def update_progress(current, total):
-            progress = (current / total) * 100
-            progress_var.set(progress)
-            status_label.config(text=f"Processing {current}/{total} files...")
-            progress_window.update()
+            # Report only when the whole percentage moves, and at most ~30 times a
+            # second, fast scans finish files far quicker than that
+            pct = current * 100 // total
+            now = time.monotonic()
+            if pct == self._last_pct or now - self._last_ui < 0.033:
+                return
+            self._last_pct = pct
+            self._last_ui = now
+            events.put(("progress", pct, current, total))
 
         def collect_data():
-            nonlocal pdf_data
             try:
+                pdf_data = []
                 for folder in self.folders:
                     folder_data = self.collect_pdfs_recursively(folder, update_progress)
                     pdf_data.extend(folder_data)
-                progress_window.destroy()
-                self.current_popup = None # Clear reference
-                self.show_results(pdf_data, os.path.basename(self.folders[0])) # Display selected folder name
+                # Hand the table over column-wise: paths, filenames, fn titles/authors, meta titles/authors
+                events.put(("done", tuple(map(list, zip(*pdf_data))) or ([],) * 6))
             except Exception as e:
-                progress_window.destroy()
-                self.current_popup = None # Clear reference
-                messagebox.showerror("Error", f"Error collecting PDF data: {e}")
+                events.put(("error", e))
+
+        def drain_events():
+            progress = None
+            try:
+                while True:
+                    kind, *args = events.get_nowait()
+                    if kind == "progress":
+                        progress = args # Only the latest one is drawn
+                        continue
+                    progress_window.destroy()
+                    self.current_popup = None # Clear reference
+                    if kind == "done" and not args[0][0]:
+                        # The scan itself tells us the folder is empty, no separate prescan walk.
+                        # Ask again from the event loop rather than by recursing.
+                        messagebox.showinfo("No PDFs Found", "The selected folder contains no PDF files. Please choose another folder.")
+                        progress_window.master.after_idle(self.browse_folders)
+                    elif kind == "done":
+                        self.show_results(args[0], os.path.basename(self.folders[0])) # Display selected folder name
+                    else:
+                        messagebox.showerror("Error", f"Error collecting PDF data: {args[0]}")
+                    return
+            except queue.Empty:
+                pass
+            if progress is not None:
+                pct, current, total = progress
+                progress_bar["value"] = pct
+                status_label.config(text=f"Processing {current}/{total} files...")
+            progress_window.after(50, drain_events)
 
         # Start collection in thread to prevent UI freezing
         thread = threading.Thread(target=collect_data, daemon=True)
         thread.start()
+        progress_window.after(50, drain_events)
 
     def select_another_folder(self):
         """Method to select another folder and refresh the view."""
@@ -199,21 +1175,12 @@ class PDFMetadataEditor:
             self.current_popup = None
         self.browse_folders() # Call browse_folders to start the process again
 
-    def refresh_data(self, popup, tree):
-        """Rescan folders and refresh the tree view"""
-        # Clear cache for accurate refresh
-        self.pdf_cache.clear()
-        
-        # Store current popup reference before destroying it
-        self.current_popup = popup
-        popup.destroy()  # Close current window
-        self.current_popup = None # Clear reference after destroying
-        self.show_progress_and_collect()  # Show new progress window and collect
-
     def show_results(self, data, folder_name):
+        # data holds parallel columns rather than a dict per file
+        paths, filenames, fn_titles, fn_authors, meta_titles, meta_authors = data
         popup = tk.Toplevel()
         popup.protocol("WM_DELETE_WINDOW", lambda: sys.exit(0))
-        popup.title(f"PDF Metadata Editor – {folder_name} ({len(data)} files)")
+        popup.title(f"PDF Metadata Editor – {folder_name} ({len(paths)} files)")
         popup.geometry("1000x600")
         popup.configure(bg="#333333") # Dark background
         self.current_popup = popup # Store reference to this popup
@@ -272,42 +1239,144 @@ class PDFMetadataEditor:
         # Scrollbars
         vsb = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
         hsb = ttk.Scrollbar(frame, orient="horizontal", command=tree.xview)
-        tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
 
         vsb.pack(side="right", fill="y")
         hsb.pack(side="bottom", fill="x")
-        tree.pack(expand=True, fill="both")
+
+        # Row iids are indexes into the columns, which stay the source of truth.
+        # Edits write through to them so fixes never read values back from Tk.
+        def update_row(item):
+            i = int(item)
+            row = (fn_titles[i], fn_authors[i], meta_titles[i], meta_authors[i])
+            if row[:2] == row[2:]:
+                self._mismatch_iids.discard(item)
+            else:
+                self._mismatch_iids.add(item)
+            if tree.exists(item): # Rows outside a virtual window are drawn when scrolled to
+                tree.item(item, values=row, tags=row_tags[item in self._mismatch_iids])
 
         def swap_fn_title_author():
-            for item in tree.selection():
-                values = list(tree.item(item)["values"])
-                # Ensure we only swap the first two values (filename title/author)
-                if len(values) >= 2:
-                    values[0], values[1] = values[1], values[0]
-                    tree.item(item, values=values)
-
-        # Insert data efficiently
-        mismatch_count = 0
-        for entry in data:
-            row = (entry["fn_title"], entry["fn_author"], entry["meta_title"], entry["meta_author"])
-            tags = [entry["path"]]
-            mismatch = row[0] != row[2] or row[1] != row[3]
-            if mismatch:
-                mismatch_count += 1
-                tags.append("mismatch")
-            tree.insert("", "end", values=row, tags=tags)
+            for item in selected_items():
+                i = int(item)
+                fn_titles[i], fn_authors[i] = fn_authors[i], fn_titles[i]
+                update_row(item)
+
+        # Mismatch mask computed column-wise in one pass, the compares run in C via operator
+        mask = list(map(operator.or_, map(operator.ne, fn_titles, meta_titles),
+                        map(operator.ne, fn_authors, meta_authors)))
+        mismatch_count = sum(mask)
+        self._mismatch_iids = set(map(str, compress(range(len(mask)), mask)))
+        row_tags = ((), ("mismatch",))  # Indexed by the mismatch flag
+
+        # Large tables are virtual: the tree only holds the rows of a window that
+        # follows the scrollbar and mouse wheel, everything else stays in the columns
+        n_rows = len(paths)
+        virtual = n_rows > _VIRTUAL_ROWS_THRESHOLD
+        view_start = 0
+        view_len = _VIEW_ROWS if virtual else n_rows
+        selected = set() # Virtual tables only: selected iids, kept so rows scrolled out of the window stay selected
+
+        def selected_items():
+            if virtual:
+                return sorted(selected, key=int) # Includes rows scrolled out of the window
+            return tree.selection()
+
+        def render():
+            tree.delete(*tree.get_children())
+            end = min(n_rows, view_start + view_len)
+            visible = [str(i) for i in range(view_start, end)]
+            for item in visible:
+                i = int(item)
+                tree.insert("", "end", iid=item,
+                            values=(fn_titles[i], fn_authors[i], meta_titles[i], meta_authors[i]),
+                            tags=row_tags[item in self._mismatch_iids])
+            tree.selection_set([item for item in visible if item in selected])
+            if virtual:
+                vsb.set(view_start / n_rows, end / n_rows)
+                # The window is a row taller than the viewport, so Tk's own "see" on
+                # keyboard focus can scroll the tree; the refilled window starts at its top
+                tree.yview_moveto(0)
+
+        def scroll_to(start):
+            nonlocal view_start
+            start = max(0, min(start, n_rows - view_len))
+            if start != view_start:
+                view_start = start
+                render()
+
+        def on_scrollbar(action, amount, unit=None):
+            if action == "moveto":
+                scroll_to(round(float(amount) * n_rows))
+            elif action == "scroll":
+                scroll_to(view_start + int(amount) * (view_len if unit == "pages" else 1))
+
+        def on_mousewheel(event):
+            # delta on Windows and macOS, buttons 4/5 on X11
+            scroll_to(view_start + (-3 if event.num == 4 or event.delta > 0 else 3))
+            return "break"
+
+        def on_arrow_key(event):
+            # Moving the focus past the window's edge scrolls it by a row
+            focus = tree.focus()
+            if not focus:
+                return None
+            target = int(focus) + (1 if event.keysym == "Down" else -1)
+            if view_start <= target < view_start + view_len:
+                return None # Within the window, Tk handles it
+            if 0 <= target < n_rows:
+                selected.clear()
+                selected.add(str(target))
+                scroll_to(view_start + (1 if target > int(focus) else -1))
+                tree.focus(str(target))
+            return "break"
+
+        def on_resize(event):
+            nonlocal view_start, view_len
+            # One more row than fits so the bottom edge is never blank (rows are 25 px, plus the heading)
+            rows = max(1, (event.height - 25) // 25 + 1)
+            if rows != view_len:
+                view_len = rows
+                view_start = max(0, min(view_start, n_rows - view_len))
+                render()
+
+        def on_click(event):
+            # Neither Shift nor Control on a row: a fresh selection. Clicks on a heading,
+            # a column separator or empty space leave the selection alone.
+            if not event.state & 0x0005 and tree.identify_region(event.x, event.y) in ("cell", "tree"):
+                selected.clear()
+
+        def on_select(event):
+            selected.difference_update(str(i) for i in range(view_start, min(n_rows, view_start + view_len)))
+            selected.update(tree.selection())
+
+        if virtual:
+            tree.bind("<Button-1>", on_click)
+            tree.bind("<<TreeviewSelect>>", on_select)
+            vsb.configure(command=on_scrollbar)
+            tree.configure(xscrollcommand=hsb.set)
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                tree.bind(sequence, on_mousewheel)
+            tree.bind("<Down>", on_arrow_key)
+            tree.bind("<Up>", on_arrow_key)
+            tree.bind("<Configure>", on_resize)
+        else:
+            tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        render()
+        # Packing only after the inserts avoids a relayout per row
+        tree.pack(expand=True, fill="both")
 
         tree.tag_configure("mismatch", background="#B00020", foreground="#FFFFFF") # Dark red for mismatch, white text
 
         # Add editable cells
         def on_double_click(event):
-            item_id = tree.identify_row(event.y)
+            # Only allow editing for filename title and author columns, checked
+            # before the other Tcl calls since every one is a round-trip
             column = tree.identify_column(event.x)
-            # Only allow editing for filename title and author columns
-            if column not in ("#1", "#2"):
+            if column not in _EDITABLE_COLS:
                 return
 
             # Ensure item_id is valid
+            item_id = tree.identify_row(event.y)
             if not item_id:
                 return
 
@@ -315,13 +1384,16 @@ class PDFMetadataEditor:
             if x is None: # Sometimes bbox returns None if item is not visible
                 return
 
+            # The current value comes from the columns, not back out of the tree
+            column_data = fn_titles if column == "#1" else fn_authors
             entry = ttk.Entry(tree, style="TEntry") # Use ttk.Entry for consistent styling
             entry.place(x=x, y=y, width=width, height=height)
-            entry.insert(0, tree.set(item_id, column))
+            entry.insert(0, column_data[int(item_id)])
             entry.focus()
 
             def save_edit(event=None):
-                tree.set(item_id, column, entry.get())
+                column_data[int(item_id)] = entry.get()
+                update_row(item_id)
                 entry.destroy()
 
             entry.bind("<Return>", save_edit)
@@ -331,23 +1403,22 @@ class PDFMetadataEditor:
 
         # Fix selected metadata with batch processing
         def fix_selected_metadata():
-            if not tree.selection():
+            selection = selected_items()
+            if not selection:
                 messagebox.showwarning("No Selection", "Please select files to update.")
                 return
 
             updates = []
-            for item in tree.selection():
-                values = tree.item(item)["values"]
-                path = tree.item(item)["tags"][0]
-                fn_title, fn_author = values[0], values[1]
-                meta_title, meta_author = values[2], values[3]
-
+            items = [] # Tree rows behind each update
+            for item in selection:
                 # Only add to updates if there's a mismatch or a manual edit was made
                 # The user explicitly asked to "just change selected", so we apply the filename derived values
-                # or manually edited values from the treeview to the PDF metadata.
-                # The check below ensures we only update if the derived/edited values are different from current PDF metadata.
-                if fn_title != meta_title or fn_author != meta_author:
-                    updates.append((path, fn_title, fn_author))
+                # or manually edited values to the PDF metadata.
+                # The mismatch set tracks which rows differ from the current PDF metadata.
+                if item in self._mismatch_iids:
+                    i = int(item)
+                    updates.append((paths[i], fn_titles[i], fn_authors[i]))
+                    items.append(item)
 
             if not updates:
                 messagebox.showinfo("No Updates", "Selected files already have matching metadata or no changes detected.")
@@ -361,11 +1432,19 @@ class PDFMetadataEditor:
             tk.Label(progress_window, text=f"Updating {len(updates)} files...", font=('Arial', 10), bg="#333333", fg="#D3D3D3").pack(pady=20)
             progress_window.update()
 
-            updated = self.update_pdf_metadata_batch(updates)
-            progress_window.destroy()
+            try:
+                updated = set(self.update_pdf_metadata_batch(updates))
+            finally:
+                progress_window.destroy()
+
+            # Patch only the rows that were written instead of rescanning the folder
+            for item, (path, title, author) in zip(items, updates):
+                if path in updated:
+                    i = int(item)
+                    meta_titles[i], meta_authors[i] = title, author
+                    update_row(item)
 
-            messagebox.showinfo("Metadata Update", f"Updated {updated} of {len(updates)} file(s).")
-            self.refresh_data(popup, tree)
+            messagebox.showinfo("Metadata Update", f"Updated {len(updated)} of {len(updates)} file(s).")
 
         # Button Frame with better layout
         btn_frame = tk.Frame(popup, bg="#333333") # Dark background
@@ -0,0 +1,131 @@
+"""Round trips through the tail reader and the incremental Info writer.
+
+Each file is updated a few times and after every update the fast reader has
+to agree with a full pypdf parse. Run with python -m unittest or pytest.
+"""
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pypdf import PdfReader, PdfWriter
+
+import pdfmetadataeditor as pme
+
+# ASCII, a literal string that needs escaping, then text that needs UTF-16
+UPDATES = [
+    ("The Shining", "Stephen King"),
+    ("Parens (2nd ed) \\ and a backslash", "O'Brien (ed.)"),
+    ("Ünicode – Ω", "Brontë"),
+]
+
+
+class TailReaderRoundTrip(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def make_pypdf(self):
+        path = os.path.join(self.tmp.name, "classic.pdf")
+        writer = PdfWriter()
+        writer.add_blank_page(200, 200)
+        writer.add_metadata({"/Title": "Original", "/Author": "Someone"})
+        with open(path, "wb") as f:
+            writer.write(f)
+        return path
+
+    def make_mupdf(self):
+        path = os.path.join(self.tmp.name, "objstm.pdf")
+        with pme.pymupdf.open() as doc:
+            doc.new_page()
+            doc.set_metadata({"title": "Original", "author": "Someone"})
+            doc.save(path, use_objstms=True, garbage=1)
+        return path
+
+    def assert_round_trips(self, path):
+        title, author, startxref = pme._fast_read_info(path)
+        self.assertEqual((title, author), ("Original", "Someone"))
+        for i, (expected_title, expected_author) in enumerate(UPDATES):
+            # Alternate between passing the startxref from the last read and finding it again
+            known = startxref if i % 2 == 0 else None
+            startxref = pme._incremental_update_info(path, expected_title, expected_author, known)
+            title, author, found = pme._fast_read_info(path)
+            self.assertEqual((title, author), (expected_title, expected_author))
+            self.assertEqual(found, startxref)
+            metadata = PdfReader(path).metadata
+            self.assertEqual((metadata.title, metadata.author), (expected_title, expected_author))
+
+    def test_pypdf_classic_xref(self):
+        path = self.make_pypdf()
+        with open(path, "rb") as f:
+            self.assertNotIn(b"/XRef", f.read())
+        self.assert_round_trips(path)
+
+    @unittest.skipIf(pme.pymupdf is None, "PyMuPDF not installed")
+    def test_mupdf_object_streams(self):
+        path = self.make_mupdf()
+        with open(path, "rb") as f:
+            data = f.read()
+        self.assertIn(b"/ObjStm", data)
+        self.assertIn(b"/XRef", data)
+        self.assert_round_trips(path)
+
+
+
+class FallbackContract(unittest.TestCase):
+    """Files the tail reader and writer can't handle must raise ValueError, the
+    signal callers use to fall back to a full parse or a rewrite, and must not
+    be modified."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        writer = PdfWriter()
+        writer.add_blank_page(200, 200)
+        writer.add_metadata({"/Title": "Original", "/Author": "Someone"})
+        out = io.BytesIO()
+        writer.write(out)
+        self.valid = out.getvalue()
+
+    def assert_falls_back(self, data):
+        path = os.path.join(self.tmp.name, "case.pdf")
+        with open(path, "wb") as f:
+            f.write(data)
+        with self.assertRaises(ValueError):
+            pme._fast_read_info(path)
+        with self.assertRaises(ValueError):
+            pme._incremental_update_info(path, "Title", "Author")
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), data)
+
+    def test_encrypted(self):
+        writer = PdfWriter()
+        writer.add_blank_page(200, 200)
+        writer.add_metadata({"/Title": "Secret"})
+        writer.encrypt("password", algorithm="RC4-128")
+        out = io.BytesIO()
+        writer.write(out)
+        self.assert_falls_back(out.getvalue())
+
+    def test_truncated(self):
+        self.assert_falls_back(self.valid[:len(self.valid) // 2])
+
+    def test_garbage(self):
+        self.assert_falls_back(b"this is not a PDF\n" * 200)
+
+    def test_empty(self):
+        self.assert_falls_back(b"")
+
+    def test_damaged_info_object(self):
+        # Neither the tail reader nor pypdf can read the Info dict once its
+        # object header is broken
+        damaged = self.valid.replace(b"1 0 obj\n<<", b"x 0 obj\n<<", 1)
+        self.assertNotEqual(damaged, self.valid)
+        self.assert_falls_back(damaged)
+
+
+if __name__ == "__main__":
+    unittest.main()